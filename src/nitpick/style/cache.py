@@ -5,10 +5,14 @@ import re
 from datetime import timedelta
 
 from loguru import logger
-from requests_cache.cache_control import DO_NOT_CACHE, NEVER_EXPIRE
 
 from nitpick.enums import CachingEnum
 
+#: Expiration time of a response that must not be stored.
+DO_NOT_CACHE = 0
+#: Expiration time of a response that is stored forever.
+NEVER_EXPIRE = -1
+
 REGEX_CACHE_UNIT = re.compile(r"(?P<number>\d+)\s+(?P<unit>(minute|hour|day|week))", re.IGNORECASE)
 EXPIRES_DEFAULTS = {
     CachingEnum.NEVER: DO_NOT_CACHE,
@@ -38,8 +38,7 @@ from nitpick.plugins.info import FileInfo
 from nitpick.project import Project, glob_files
 from nitpick.schemas import BaseStyleSchema, flatten_marshmallow_errors
 from nitpick.style.config import ConfigValidator
-from nitpick.style.fetchers import Scheme, StyleFetcherManager
-from nitpick.style.fetchers.github import GitHubURL
+from nitpick.style.fetchers import Scheme
 from nitpick.typedefs import JsonDict, StrOrIterable, StrOrList, mypy_property
 from nitpick.violations import Fuss, Reporter, StyleViolations
 
@@ -60,6 +59,10 @@ class StyleManager:  # pylint: disable=too-many-instance-attributes
         self._already_included: set[str] = set()
         self._first_full_path: str = ""
         self._dynamic_schema_class: type = BaseStyleSchema
+
+        # Imported here so importing nitpick.style doesn't load the fetcher manager and its HTTP session
+        from nitpick.style.fetchers import StyleFetcherManager  # pylint: disable=import-outside-toplevel
+
         self._style_fetcher_manager = StyleFetcherManager(self.offline, self.cache_dir, self.cache_option)
         self._config_validator = ConfigValidator(self.project)
         self.rebuild_dynamic_schema()
@@ -84,6 +87,9 @@ class StyleManager:  # pylint: disable=too-many-instance-attributes
     def get_default_style_url(github=False):
         """Return the URL of the default style/preset."""
         if github:
+            # Imported here so the GitHub and HTTP fetchers (and requests) are only loaded when needed
+            from nitpick.style.fetchers.github import GitHubURL  # pylint: disable=import-outside-toplevel
+
             return GitHubURL(PROJECT_OWNER, PROJECT_NAME, f"v{__version__}", NITPICK_STYLE_TOML).long_protocol_url
 
         rv = furl(scheme=Scheme.PY, host=PROJECT_NAME, path=SLASH.join(["resources", "presets", PROJECT_NAME]))
@@ -3,13 +3,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import ClassVar, Dict
+from typing import TYPE_CHECKING, ClassVar, Dict
 
-from requests_cache import CachedSession
 from slugify import slugify
 
 from nitpick.generic import is_url
-from nitpick.style.fetchers import StyleInfo
+
+if TYPE_CHECKING:
+    from nitpick.style.fetchers import StyleInfo
+    from nitpick.style.fetchers.session import CachedSession
 
 
 @dataclass(repr=True)
@@ -0,0 +1,201 @@
+"""Manager that chooses a style fetcher for each URL."""
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from functools import lru_cache
+from importlib import import_module
+from itertools import chain
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from autorepr import autorepr
+
+from nitpick.enums import CachingEnum
+from nitpick.style import parse_cache_option
+from nitpick.style.fetchers import Scheme
+
+if TYPE_CHECKING:
+    # Only needed for annotations, which are never evaluated at runtime here (PEP 563):
+    # don't resolve them with typing.get_type_hints() or dataclass introspection
+    from nitpick.style.fetchers import StyleInfo
+    from nitpick.style.fetchers.base import FetchersType, StyleFetcher
+    from nitpick.style.fetchers.session import CachedSession
+    from nitpick.typedefs import PathOrStr
+
+_SCHEME_VALUES: frozenset[str] = frozenset(sys.intern(scheme.value) for scheme in Scheme)
+
+# Fetcher classes with the protocols and domains they handle; their modules are only imported when a style needs them
+_FETCHER_SPECS: tuple[tuple[str, tuple[str, ...], tuple[str, ...]], ...] = (
+    ("nitpick.style.fetchers.file.FileFetcher", ("file", ""), ()),
+    ("nitpick.style.fetchers.http.HttpFetcher", (Scheme.HTTP, Scheme.HTTPS), ()),
+    ("nitpick.style.fetchers.github.GitHubFetcher", (Scheme.GH, Scheme.GITHUB), ("github.com",)),
+    ("nitpick.style.fetchers.pypackage.PythonPackageFetcher", (Scheme.PY, Scheme.PYPACKAGE), ()),
+)
+# Interned keys: the dict lookup then matches the interned scheme/domain strings by identity
+_FETCHER_CLASSES: dict[str, str] = {
+    sys.intern(str(key)): class_path
+    for class_path, protocols, domains in _FETCHER_SPECS
+    for key in (*protocols, *domains)
+}
+
+# Maximum number of styles kept by StyleFetcherManager.fetch()
+FETCH_CACHE_SIZE = 256
+
+
+class StyleFetcherManager:
+    """Manager that controls which fetcher to be used given a protocol.
+
+    With ``cache_fetches``, styles from fetchers that don't require a connection (local files, Python packages)
+    are fetched only once; remote styles are cached by the HTTP session, honouring the configured expiration.
+    """
+
+    __slots__ = ("offline", "cache_dir", "cache_option", "cache_fetches", "fetchers", "_session", "_fetch_cache")
+    __repr__ = autorepr(["offline", "cache_dir", "cache_option"])
+
+    def __init__(self, offline: bool, cache_dir: PathOrStr, cache_option: str, cache_fetches: bool = True) -> None:
+        self.offline = offline
+        self.cache_dir = cache_dir
+        self.cache_option = cache_option
+        self.cache_fetches = cache_fetches
+
+        self.fetchers: FetchersType = {}
+        self._session: CachedSession | None = None
+        self._fetch_cache: OrderedDict[tuple[str, bool], StyleInfo] = OrderedDict()
+
+    @property
+    def session(self) -> CachedSession:
+        """Cached HTTP session, only created when a fetcher that requires a connection is used."""
+        if self._session is None:
+            # Imported here so requests is only loaded when a style is downloaded
+            from nitpick.style.fetchers.session import CachedSession  # pylint: disable=import-outside-toplevel
+
+            caching, expire_after = parse_cache_option(self.cache_option)
+            # honour caching headers on the response when an expiration time has
+            # been set meaning that the server can dictate cache expiration
+            # overriding the local expiration time. This may need to become a
+            # separate configuration option in future.
+            cache_control = caching is CachingEnum.EXPIRES
+            styles_path = Path(self.cache_dir) / "styles"
+            self._session = CachedSession(styles_path, expire_after=expire_after, cache_control=cache_control)
+        return self._session
+
+    def fetch(self, url) -> StyleInfo:
+        """Determine which fetcher to be used and fetch from it.
+
+        Try a fetcher by domain first, then by protocol scheme.
+        """
+        cache_key = (url, self.offline)
+        if cache_key in self._fetch_cache:
+            self._fetch_cache.move_to_end(cache_key)
+            return self._fetch_cache[cache_key]
+
+        domain, scheme = self._get_domain_scheme(url)
+        key = domain if domain and (domain in self.fetchers or domain in _FETCHER_CLASSES) else scheme
+        fetcher_class = self._get_fetcher_class(key)
+        if fetcher_class is None:
+            raise RuntimeError(f"URI protocol {scheme!r} is not supported")
+
+        # Checked before creating the fetcher, so an offline manager never creates the HTTP session
+        if self.offline and fetcher_class.requires_connection:
+            return None, ""
+
+        fetcher = self._get_fetcher(key, fetcher_class)
+        style_info = fetcher.fetch(url)
+        if self.cache_fetches and not fetcher.requires_connection:
+            self._fetch_cache[cache_key] = style_info
+            if len(self._fetch_cache) > FETCH_CACHE_SIZE:
+                self._fetch_cache.popitem(last=False)
+        return style_info
+
+    def _get_fetcher_class(self, key: str) -> type[StyleFetcher] | None:
+        """Get the fetcher class for a protocol or domain, without creating the fetcher."""
+        fetcher = self.fetchers.get(key)
+        if fetcher is not None:
+            return type(fetcher)
+        if key in _FETCHER_CLASSES:
+            return _import_fetcher_class(_FETCHER_CLASSES[key])
+        return None
+
+    def _get_fetcher(self, key: str, fetcher_class: type[StyleFetcher]) -> StyleFetcher:
+        """Get the fetcher for a protocol or domain, creating it the first time it's needed."""
+        fetcher = self.fetchers.get(key)
+        if fetcher is None:
+            fetcher = fetcher_class(self.session) if fetcher_class.requires_connection else _shared_fetcher(fetcher_class)
+            for fetcher_key in chain(fetcher.protocols, fetcher.domains):
+                self.fetchers[sys.intern(str(fetcher_key))] = fetcher
+        return fetcher
+
+    @staticmethod
+    @lru_cache()
+    def _get_domain_scheme(url: str) -> tuple[str, str]:
+        r"""Get domain and scheme from an URL or a file.
+
+        >>> StyleFetcherManager._get_domain_scheme("/abc")
+        ('', 'file')
+        >>> StyleFetcherManager._get_domain_scheme("file:///abc")
+        ('', 'file')
+        >>> StyleFetcherManager._get_domain_scheme(r"c:\abc")
+        ('', 'file')
+        >>> StyleFetcherManager._get_domain_scheme("c:/abc")
+        ('', 'file')
+        >>> StyleFetcherManager._get_domain_scheme("http://server.com/abc")
+        ('server.com', 'http')
+        """
+        fast_result = _fast_host_scheme(url)
+        if fast_result is not None:
+            host, scheme = fast_result
+            netloc = host
+        else:
+            parsed_url = urlsplit(url)
+            scheme, netloc, host = parsed_url.scheme, parsed_url.netloc, parsed_url.hostname or ""
+        if scheme in _SCHEME_VALUES or (scheme and netloc):
+            return sys.intern(host), sys.intern(scheme)
+        return "", "file"
+
+
+def _fast_host_scheme(url: str) -> tuple[str, str] | None:
+    """Get host and scheme from a plain ``scheme://host/path`` URL by slicing the string.
+
+    Return ``None`` when the URL needs a full :py:func:`urllib.parse.urlsplit` (credentials, port, IPv6,
+    percent-encoded characters...).
+
+    >>> _fast_host_scheme("HTTPS://Server.com/abc?q=1")
+    ('server.com', 'https')
+    >>> _fast_host_scheme("py://nitpick/resources/presets/nitpick")
+    ('nitpick', 'py')
+    >>> _fast_host_scheme("file:///abc")
+    ('', 'file')
+    >>> _fast_host_scheme("gh://$TOKEN@andreoliwa/nitpick/style.toml") is None
+    True
+    >>> _fast_host_scheme("github://Percent%2Dencoded/nitpick/style.toml") is None
+    True
+    >>> _fast_host_scheme("/abc") is None
+    True
+    """
+    separator = url.find("://")
+    if separator < 1 or separator > 10:
+        return None
+    scheme = url[:separator]
+    if not (scheme.isascii() and scheme.isalpha()):
+        return None
+    rest = url[separator + 3 :]
+    for delimiter in "/?#":
+        position = rest.find(delimiter)
+        if position >= 0:
+            rest = rest[:position]
+    if any(char in rest for char in "@:[]%\\") or not rest.isprintable():
+        return None
+    return rest.lower(), scheme.lower()
+
+
+@lru_cache()
+def _shared_fetcher(klass: type[StyleFetcher]) -> StyleFetcher:
+    """Fetchers that don't require a connection have no state, so all managers share the same instance."""
+    return klass()
+
+
+def _import_fetcher_class(class_path: str) -> type[StyleFetcher]:
+    module_name, class_name = class_path.rsplit(".", 1)
+    return getattr(import_module(module_name), class_name)
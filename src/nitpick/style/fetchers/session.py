@@ -0,0 +1,217 @@
+"""HTTP session with a small persistent cache, used by fetchers that require a connection."""
+from __future__ import annotations
+
+import dbm
+import json
+import time
+from base64 import b64decode, b64encode
+from dataclasses import dataclass, replace
+from datetime import timedelta
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from pathlib import Path
+from typing import Mapping
+
+from loguru import logger
+from requests import Request, Response, Session
+from requests.structures import CaseInsensitiveDict
+
+from nitpick.style.cache import DO_NOT_CACHE, NEVER_EXPIRE
+
+# JSON types of the fields of a cache entry; ``content`` is stored base64-encoded
+_ENTRY_FIELD_TYPES: dict[str, type | tuple[type, ...]] = {
+    "url": str,
+    "status_code": int,
+    "reason": str,
+    "headers": dict,
+    "content": str,
+    "encoding": (str, type(None)),
+    "expires": (int, float, type(None)),
+}
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A response stored on the cache; the request that produced it (and its credentials) is not kept."""
+
+    url: str
+    status_code: int
+    reason: str
+    headers: dict[str, str]
+    content: bytes
+    encoding: str | None
+    #: Timestamp after which the response is stale, or ``None`` if it never expires.
+    expires: float | None
+
+    @classmethod
+    def from_response(cls, response: Response, expires: float | None) -> CachedResponse:
+        """Create a cache entry from a response received from the server."""
+        return cls(
+            url=response.url,
+            status_code=response.status_code,
+            reason=response.reason,
+            headers=dict(response.headers),
+            content=response.content,
+            encoding=response.encoding,
+            expires=expires,
+        )
+
+    @classmethod
+    def from_json(cls, raw: bytes) -> CachedResponse:
+        """Load a cache entry; raise :py:class:`ValueError` or :py:class:`KeyError` if it's malformed."""
+        data = json.loads(raw)
+        if not isinstance(data, dict) or not all(
+            isinstance(data.get(name), types) for name, types in _ENTRY_FIELD_TYPES.items()
+        ):
+            raise ValueError(f"Malformed style cache entry: {data!r:.100}")
+        return cls(
+            url=data["url"],
+            status_code=data["status_code"],
+            reason=data["reason"],
+            headers={str(name): str(value) for name, value in data["headers"].items()},
+            content=b64decode(data["content"], validate=True),
+            encoding=data["encoding"],
+            expires=data["expires"],
+        )
+
+    def to_json(self) -> str:
+        """Serialize the cache entry."""
+        return json.dumps(
+            {
+                "url": self.url,
+                "status_code": self.status_code,
+                "reason": self.reason,
+                "headers": self.headers,
+                "content": b64encode(self.content).decode("ascii"),
+                "encoding": self.encoding,
+                "expires": self.expires,
+            }
+        )
+
+    @property
+    def is_expired(self) -> bool:
+        """Whether the response is stale and has to be fetched again."""
+        return self.expires is not None and self.expires <= time.time()
+
+    def to_response(self) -> Response:
+        """Rebuild a :py:class:`requests.Response` from the cache entry."""
+        response = Response()
+        response.url = self.url
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content  # pylint: disable=protected-access
+        response.encoding = self.encoding
+        return response
+
+
+class CachedSession(Session):
+    """HTTP session that stores successful ``GET`` responses as JSON in a :py:mod:`dbm` file, keyed by URL.
+
+    Only the small subset of HTTP caching needed for style files is supported:
+
+    - responses expire after ``expire_after`` (``DO_NOT_CACHE``, ``NEVER_EXPIRE`` or a :py:class:`timedelta`);
+    - with ``cache_control``, the ``Cache-Control`` (``no-store``, ``max-age``) and ``Expires`` response headers
+      override the local expiration time;
+    - expired responses are revalidated with ``If-None-Match`` / ``If-Modified-Since``, a ``304 Not Modified``
+      answer keeps the cached content.
+
+    The :py:mod:`dbm` backends don't lock the file, so the cache is not safe to share
+    between processes running at the same time. An entry that can't be read is treated as a cache miss: the style
+    is downloaded again and the entry is overwritten.
+    """
+
+    def __init__(
+        self, cache_name: Path | str, expire_after: timedelta | int = NEVER_EXPIRE, cache_control: bool = False
+    ) -> None:
+        super().__init__()
+        self.cache_name = str(cache_name)
+        self.expire_after = expire_after
+        self.cache_control = cache_control
+
+    def get(self, url, params=None, **kwargs) -> Response:
+        """Send a GET request, or return the cached response while it's still fresh.
+
+        Responses are cached by the full request URL, including the query string built from ``params``.
+        """
+        key = Request("GET", url, params=params).prepare().url or url
+        cached = self._load(key)
+        if cached is not None and not cached.is_expired:
+            return cached.to_response()
+
+        if cached is not None:
+            cached_headers = CaseInsensitiveDict(cached.headers)
+            headers = dict(kwargs.get("headers") or {})
+            if "ETag" in cached_headers:
+                headers["If-None-Match"] = cached_headers["ETag"]
+            if "Last-Modified" in cached_headers:
+                headers["If-Modified-Since"] = cached_headers["Last-Modified"]
+            kwargs["headers"] = headers
+
+        response = super().get(url, params=params, **kwargs)
+        if cached is not None and response.status_code == HTTPStatus.NOT_MODIFIED:
+            cached = replace(cached, expires=self._get_expires(response.headers))
+            self._save(key, cached)
+            return cached.to_response()
+
+        if response.status_code == HTTPStatus.OK:
+            self._save(key, CachedResponse.from_response(response, self._get_expires(response.headers)))
+        return response
+
+    def _get_expires(self, headers: Mapping[str, str]) -> float | None:
+        seconds = _seconds_to_expire_from_headers(headers) if self.cache_control else None
+        if seconds is None:
+            # Only the configured expiration can mean "never expire"; any value from the headers is a real duration
+            if self.expire_after == NEVER_EXPIRE:
+                return None
+            if isinstance(self.expire_after, timedelta):
+                seconds = self.expire_after.total_seconds()
+            else:
+                seconds = self.expire_after
+        return time.time() + max(seconds, DO_NOT_CACHE)
+
+    def _load(self, url: str) -> CachedResponse | None:
+        try:
+            with dbm.open(self.cache_name, "r") as cache:
+                raw = cache.get(url)
+        except dbm.error as err:
+            logger.debug(f"Style cache not available: {err}")
+            return None
+        if raw is None:
+            return None
+        try:
+            return CachedResponse.from_json(raw)
+        except (ValueError, KeyError) as err:
+            logger.debug(f"Ignoring malformed style cache entry for {url}: {err}")
+            return None
+
+    def _save(self, url: str, cached: CachedResponse) -> None:
+        if cached.is_expired:
+            return
+        try:
+            with dbm.open(self.cache_name, "c") as cache:
+                cache[url] = cached.to_json()
+        except dbm.error as err:
+            logger.debug(f"Style cache not available: {err}")
+
+
+def _seconds_to_expire_from_headers(headers: Mapping[str, str]) -> float | None:
+    """Seconds until expiration dictated by the ``Cache-Control`` or ``Expires`` headers, or ``None`` if absent."""
+    directives = {}
+    for directive in headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        directives[name.lower()] = value
+
+    if "no-store" in directives:
+        return DO_NOT_CACHE
+    if directives.get("max-age", "").isdigit():
+        return int(directives["max-age"])
+
+    expires = headers.get("Expires")
+    if expires:
+        try:
+            return parsedate_to_datetime(expires).timestamp() - time.time()
+        except (TypeError, ValueError):
+            # An invalid date means the response is already expired
+            return DO_NOT_CACHE
+    return None
@@ -1,12 +1,16 @@
 """Test cache."""
+import dbm
+import json
+import pickle  # nosec
 from datetime import timedelta
 
 import pytest
 from freezegun import freeze_time
-from requests_cache.cache_control import DO_NOT_CACHE, NEVER_EXPIRE
+from responses import RequestsMock
 
 from nitpick.enums import CachingEnum
-from nitpick.style.cache import parse_cache_option
+from nitpick.style.cache import DO_NOT_CACHE, NEVER_EXPIRE, parse_cache_option
+from nitpick.style.fetchers.session import CachedSession
 
 
 @pytest.mark.tool_nitpick("cache = 'forever'")
@@ -135,3 +139,104 @@ def test_default_cache_when_nothing_provided(project_remote):
         # Time's up: another HTTP request
         frozen_datetime.move_to("2021-03-16 12:01")
         project_remote.api_check().assert_violations().assert_call_count(2)
+
+
+def test_cache_control_header_overrides_expiration(tmp_path):
+    """Test the server dictating the expiration time with the ``Cache-Control`` header."""
+    url = "https://example.com/style.toml"
+    session = CachedSession(tmp_path / "styles", expire_after=timedelta(hours=1), cache_control=True)
+    with freeze_time("2021-03-10 22:00") as frozen_datetime, RequestsMock() as mocked_response:
+        mocked_response.add(mocked_response.GET, url, "content", headers={"Cache-Control": "max-age=60"})
+        assert session.get(url).text == "content"
+        assert session.get(url).text == "content"
+        assert mocked_response.assert_call_count(url, 1)
+
+        # Expired after one minute, not one hour
+        frozen_datetime.move_to("2021-03-10 22:02")
+        assert session.get(url).text == "content"
+        assert mocked_response.assert_call_count(url, 2)
+
+        # The no-store directive disables the cache
+        mocked_response.replace(mocked_response.GET, url, "other", headers={"Cache-Control": "no-store"})
+        frozen_datetime.move_to("2021-03-10 22:04")
+        assert session.get(url).text == "other"
+        assert session.get(url).text == "other"
+        assert mocked_response.assert_call_count(url, 4)
+
+
+def test_expires_header_in_the_past_is_not_cached(tmp_path):
+    """Test an ``Expires`` header one second in the past not being mistaken for "never expire"."""
+    url = "https://example.com/style.toml"
+    session = CachedSession(tmp_path / "styles", expire_after=timedelta(hours=1), cache_control=True)
+    with freeze_time("2021-03-10 22:00:00"), RequestsMock() as mocked_response:
+        mocked_response.add(mocked_response.GET, url, "content", headers={"Expires": "Wed, 10 Mar 2021 21:59:59 GMT"})
+        assert session.get(url).text == "content"
+        assert session.get(url).text == "content"
+        assert mocked_response.assert_call_count(url, 2)
+
+
+def test_expired_response_is_revalidated(tmp_path):
+    """Test an expired response being revalidated with its ``ETag``, and kept when not modified."""
+    url = "https://example.com/style.toml"
+    session = CachedSession(tmp_path / "styles", expire_after=timedelta(minutes=15))
+    with freeze_time("2021-03-10 22:00") as frozen_datetime, RequestsMock() as mocked_response:
+        mocked_response.add(mocked_response.GET, url, "content", headers={"ETag": '"abc"'})
+        assert session.get(url).text == "content"
+
+        mocked_response.replace(mocked_response.GET, url, "", status=304)
+        frozen_datetime.move_to("2021-03-10 22:16")
+        assert session.get(url).text == "content"
+        assert mocked_response.calls[-1].request.headers["If-None-Match"] == '"abc"'
+
+        # The cached response is fresh again
+        assert session.get(url).text == "content"
+        assert mocked_response.assert_call_count(url, 2)
+
+
+def test_query_parameters_are_part_of_the_cache_key(tmp_path):
+    """Test requests with different ``params`` being cached separately."""
+    url = "https://example.com/style.toml"
+    session = CachedSession(tmp_path / "styles")
+    with RequestsMock() as mocked_response:
+        mocked_response.add(mocked_response.GET, f"{url}?ref=main", "main")
+        mocked_response.add(mocked_response.GET, f"{url}?ref=develop", "develop")
+        for _ in range(2):
+            assert session.get(url, params={"ref": "main"}).text == "main"
+            assert session.get(url, params={"ref": "develop"}).text == "develop"
+        assert len(mocked_response.calls) == 2
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        b"\x80\x04garbage",
+        b"",
+        b"[]",
+        pickle.dumps({"url": "https://example.com/style.toml"}),
+        json.dumps({"url": "https://example.com/style.toml"}).encode(),
+        json.dumps(
+            {
+                "url": "https://example.com/style.toml",
+                "status_code": 200,
+                "reason": "OK",
+                "headers": {},
+                "content": "not base64!",
+                "encoding": None,
+                "expires": None,
+            }
+        ).encode(),
+    ],
+)
+def test_corrupt_cache_entry_is_a_miss(tmp_path, entry):
+    """Test an unreadable cache entry being downloaded again and overwritten, instead of crashing."""
+    url = "https://example.com/style.toml"
+    cache_name = str(tmp_path / "styles")
+    with dbm.open(cache_name, "c") as cache:
+        cache[url] = entry
+
+    session = CachedSession(cache_name)
+    with RequestsMock() as mocked_response:
+        mocked_response.add(mocked_response.GET, url, "content")
+        assert session.get(url).text == "content"
+        assert session.get(url).text == "content"
+        assert mocked_response.assert_call_count(url, 1)
@@ -172,9 +172,12 @@ def test_has_multiple_config_files(tmp_path, caplog):
     assert f"Config file: ignoring existing {project.root_dir / PYPROJECT_TOML}" in caplog.text
 
 
-@pytest.mark.parametrize(
-    "root_file",
-    [
+def test_use_current_dir_dont_climb_dirs_to_find_project_root(tmp_path):
+    """Use current dir; don't climb dirs to find the project root.
+
+    All root files are checked in one test, each one on its own directory under the same temporary dir.
+    """
+    for root_file in [
         DOT_NITPICK_TOML,
         PRE_COMMIT_CONFIG_YAML,
         PYPROJECT_TOML,
@@ -191,26 +194,23 @@ def test_has_multiple_config_files(tmp_path, caplog):
         GO_MOD,
         GO_SUM,
         NITPICK_STYLE_TOML,
-    ],
-)
-def test_use_current_dir_dont_climb_dirs_to_find_project_root(tmp_path, root_file):
-    """Use current dir; don't climb dirs to find the project root."""
-    root = tmp_path / "deep" / "root"
-    root.mkdir(parents=True)
-    (root / root_file).write_text("")
-
-    os.chdir(str(root))
-    assert confirm_project_root(root) == root, root_file
-    assert confirm_project_root(str(root)) == root, root_file
-
-    inner_dir = root / "going" / "down" / "the" / "rabbit" / "hole"
-    inner_dir.mkdir(parents=True)
-
-    os.chdir(str(inner_dir))
-    with pytest.raises(QuitComplainingError):
-        confirm_project_root(inner_dir)
-    with pytest.raises(QuitComplainingError):
-        confirm_project_root(str(inner_dir))
+    ]:
+        root = tmp_path / root_file / "deep" / "root"
+        root.mkdir(parents=True)
+        (root / root_file).write_text("")
+
+        os.chdir(str(root))
+        assert confirm_project_root(root) == root, root_file
+        assert confirm_project_root(str(root)) == root, root_file
+
+        inner_dir = root / "going" / "down" / "the" / "rabbit" / "hole"
+        inner_dir.mkdir(parents=True)
+
+        os.chdir(str(inner_dir))
+        with pytest.raises(QuitComplainingError):
+            confirm_project_root(inner_dir)
+        with pytest.raises(QuitComplainingError):
+            confirm_project_root(str(inner_dir))
 
 
 def test_find_root_django(tmp_path):
@@ -1,16 +1,19 @@
 """Style tests."""
 import warnings
 from base64 import b64encode
+from importlib import import_module
 from pathlib import Path
 from textwrap import dedent
 from unittest import mock
 from unittest.mock import PropertyMock
+from urllib.parse import urljoin
 
 import pytest
 import responses
 
 from nitpick.constants import DOT_SLASH, PYPROJECT_TOML, READ_THE_DOCS_URL, SETUP_CFG, TOML_EXTENSION, TOX_INI
 from nitpick.style.fetchers.github import GitHubURL
+from nitpick.style.fetchers.manager import _FETCHER_SPECS, StyleFetcherManager
 from nitpick.style.fetchers.pypackage import PythonPackageURL
 from nitpick.violations import Fuss
 from tests.helpers import SUGGESTION_BEGIN, SUGGESTION_END, XFAIL_ON_WINDOWS, ProjectMock, assert_conditions
@@ -983,3 +986,57 @@ def test_protocol_not_supported(tmp_path):
     with pytest.raises(RuntimeError) as exc_info:
         project.api_check()
     assert str(exc_info.value) == "URI protocol 'abc' is not supported"
+
+
+@pytest.mark.parametrize("class_path,protocols,domains", _FETCHER_SPECS)
+def test_fetcher_specs_match_fetcher_classes(class_path, protocols, domains):
+    """Test the protocols and domains registered for lazily imported fetchers are the ones declared on the class."""
+    module_name, class_name = class_path.rsplit(".", 1)
+    klass = getattr(import_module(module_name), class_name)
+    assert klass.protocols == protocols
+    assert klass.domains == domains
+
+
+@responses.activate
+def test_session_is_only_created_when_needed(tmp_path):
+    """Test the cached HTTP session isn't created when no style requires a connection."""
+    style_path = tmp_path / "style.toml"
+    style_path.write_text("[tool.black]\n")
+    manager = StyleFetcherManager(False, tmp_path, "")
+
+    manager.fetch(str(style_path))
+    manager.fetch("py://nitpick/resources/presets/nitpick.toml")
+    assert manager._session is None  # pylint: disable=protected-access
+
+    url = "https://example.com/style.toml"
+    responses.add(responses.GET, url, "[tool.black]\n", status=200)
+    manager.fetch(url)
+    assert manager._session is not None  # pylint: disable=protected-access
+
+
+def test_offline_manager_does_not_create_the_session(tmp_path):
+    """Test an offline manager skipping remote styles without creating the cached HTTP session."""
+    manager = StyleFetcherManager(True, tmp_path, "")
+    assert manager.fetch("https://example.com/style.toml") == (None, "")
+    assert manager.fetch("https://github.com/andreoliwa/nitpick/blob/develop/nitpick-style.toml") == (None, "")
+    assert manager._session is None  # pylint: disable=protected-access
+
+
+@pytest.mark.parametrize("cache_fetches", [True, False])
+def test_local_styles_are_fetched_once(tmp_path, cache_fetches):
+    """Test local styles being fetched only once by the same manager, unless the fetch cache is disabled."""
+    style_path = tmp_path / "style.toml"
+    style_path.write_text("[tool.black]\n")
+    manager = StyleFetcherManager(False, tmp_path, "", cache_fetches=cache_fetches)
+    assert manager.fetch(str(style_path)) == (style_path, "[tool.black]\n")
+
+    style_path.write_text("[tool.isort]\n")
+    expected_contents = "[tool.black]\n" if cache_fetches else "[tool.isort]\n"
+    assert manager.fetch(str(style_path)) == (style_path, expected_contents)
+
+
+@pytest.mark.parametrize("scheme", ["py", "pypackage", "gh", "github"])
+def test_urljoin_with_custom_protocols(scheme):
+    """Test custom protocols being registered on urllib, so relative styles can be joined to them."""
+    joined_url = urljoin(f"{scheme}://owner/repo/styles/base.toml", "other.toml")
+    assert joined_url == f"{scheme}://owner/repo/styles/other.toml"